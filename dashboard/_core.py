@@ -0,0 +1,536 @@
+# _core.py
+# Shared loaders, cached aggregates, plot helpers and tab renderers for the dashboards.
+# Every entry script imports these, so Streamlit keeps one cache per function for all apps.
+from itertools import cycle
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from _cache import ensure_parquet
+from _kernels import campaign_rates, grouped_hist, minmax_norm, overview_kpis
+
+# -------------------------------
+# Load data
+# -------------------------------
+# Minimal column sets for the per-row frames the charts plot; KPIs, aggregates and histograms
+# read their own columns through the cached helpers, and filtered loads add city/gender themselves.
+CLEANED_COLS = ("frequency", "monetary", "recency_days", "avg_support_score")
+ENRICHED_COLS = ("sentiment_score", "avg_support_score")
+PREDICTED_COLS = ("segment", "pca1", "pca2")
+SUPPORT_METRICS = ("total_tickets", "avg_resolution_time", "avg_support_score")
+CAMPAIGN_COLS = ("campaign_name", "campaign_type", "budget", "impressions", "clicks",
+                 "conversion_rate", "roi")
+# Plotted/aggregated measures that float32 represents well enough, and small integer counts
+FLOAT32_COLS = ("monetary", "recency_days", "avg_support_score", "avg_resolution_time",
+                "sentiment_score", "satisfaction_index", "engagement_score", "pca1", "pca2",
+                "budget", "conversion_rate", "roi")
+COUNT_COLS = ("frequency", "total_tickets")
+# Whole-number campaign counts stored as nullable doubles; int32 keeps the nulls
+INT32_COLS = ("clicks", "impressions")
+
+def apply_filters(df, city=None, gender=None, cols=None):
+    """Slice `df` (optionally down to `cols`) with one combined mask; All/All returns `df` as-is."""
+    if city is None and gender is None:
+        return df
+    mask = np.ones(len(df), dtype=bool)
+    if city is not None:
+        mask &= (df["city"] == city).to_numpy()
+    if gender is not None:
+        mask &= (df["gender"] == gender).to_numpy()
+    return df.loc[mask, cols if cols is not None else slice(None)]
+
+@st.cache_data
+def load_table(table, cols, city=None, gender=None):
+    if city is not None or gender is not None:
+        # Filtered views are sliced from the cached All/All frame rather than re-read from
+        # Parquet; the default view below never goes through the filter code at all.
+        filter_cols = [c for c, v in (("city", city), ("gender", gender)) if v is not None]
+        df = load_table(table, tuple(dict.fromkeys([*cols, *filter_cols])))
+        return apply_filters(df, city, gender, list(cols))
+    df = pq.read_table(ensure_parquet(table), columns=list(cols)).to_pandas(types_mapper=pd.ArrowDtype)
+    # Low-cardinality labels as categoricals, 0/1 flags as int8 (filters then compare codes)
+    for c in ("city", "gender", "sentiment_label", "segment", "campaign_type"):
+        if c in df:
+            df[c] = df[c].astype("category")
+    for c in ("churn_flag", "has_transaction"):
+        if c in df:
+            df[c] = df[c].astype("int8")
+    # Halve the bytes held in cache and shipped to the browser for every plotted measure
+    for c in FLOAT32_COLS:
+        if c in df:
+            df[c] = df[c].astype(pd.ArrowDtype(pa.float32()))
+    for c in COUNT_COLS:
+        if c in df:
+            df[c] = pd.to_numeric(df[c], downcast="integer")
+    for c in INT32_COLS:
+        if c in df:
+            df[c] = df[c].astype(pd.ArrowDtype(pa.int32()))
+    return df
+
+@st.cache_data
+def filter_options():
+    """Sorted, null-free city and gender choices for the sidebar."""
+    df = load_table("customer_360_cleaned", ("city", "gender"))
+    return df["city"].cat.categories.tolist(), df["gender"].cat.categories.tolist()
+
+
+# -------------------------------
+# Cached aggregates (one entry per city/gender combo, reused across reruns)
+# -------------------------------
+@st.cache_data
+def kpi_tuple(city, gender):
+    """(revenue, active customers, customers, avg satisfaction, churn rate %) for a filter combo."""
+    df = load_table("customer_360_cleaned", ("monetary", "has_transaction", "avg_support_score"), city, gender)
+    churn = load_table("customer_360_predicted", ("churn_flag",), city, gender)["churn_flag"]
+    revenue, active, satisfaction, churn_share = overview_kpis(
+        df["monetary"].to_numpy("float64"),
+        df["has_transaction"].to_numpy(),
+        df["avg_support_score"].to_numpy("float64"),
+        churn.to_numpy(),
+    )
+    return float(revenue), int(active), len(df), float(satisfaction), float(churn_share * 100)
+
+@st.cache_data
+def city_spend_top10(city, gender):
+    df = load_table("customer_360_cleaned", ("city", "monetary"), city, gender)
+    return df.groupby("city", observed=True)["monetary"].sum().nlargest(10).reset_index()
+
+@st.cache_data
+def gender_avg_spend(city, gender):
+    df = load_table("customer_360_cleaned", ("gender", "monetary"), city, gender)
+    return df.groupby("gender", observed=True)["monetary"].mean().reset_index()
+
+@st.cache_data
+def support_corr(city, gender):
+    arr = load_table("customer_360_cleaned", SUPPORT_METRICS, city, gender).to_numpy(dtype=np.float32)
+    corr = np.corrcoef(arr, rowvar=False, dtype=np.float32)
+    # float32 rounding leaves a 0.99999994 diagonal and uneven mirror cells; restore both
+    corr = (corr + corr.T) / 2
+    np.fill_diagonal(corr, 1)
+    return corr
+
+@st.cache_data
+def binned_counts(table, col, by=None, bins=30, city=None, gender=None):
+    """Histogram `col` (optionally per `by` group) over one shared set of bin edges in one pass."""
+    cols = (col,) if by is None else (col, by)
+    df = load_table(table, cols, city, gender)
+    values = df[col].to_numpy("float64", na_value=np.nan)
+    keep = ~np.isnan(values)
+    values = values[keep]
+    if by is None:
+        codes, labels = np.zeros(len(values), np.intp), [col]
+    else:
+        # Groups in order of first appearance, like px.histogram's color traces
+        codes, labels = pd.factorize(df[by].to_numpy()[keep])
+    edges = np.histogram_bin_edges(values, bins=bins)
+    counts = grouped_hist(values, codes, len(labels), edges)
+    return edges, dict(zip(labels, counts))
+
+def with_campaign_rates(df):
+    """Return a copy of a campaigns frame with CTR, CPC and roi_clean added, computed on float32 buffers.
+
+    `df` itself is left untouched. A zero denominator yields 0 instead of inf; missing inputs stay NaN.
+    """
+    ctr, cpc, roi_clean = campaign_rates(*(df[c].to_numpy(np.float32, na_value=np.nan)
+                                           for c in ("clicks", "impressions", "budget", "roi")))
+    return df.assign(CTR=ctr, CPC=cpc, roi_clean=roi_clean)
+
+@st.cache_data(show_spinner=False)
+def campaign_metrics():
+    """Campaigns with CTR, CPC and roi_clean already derived: the one campaigns view every chart reads.
+
+    Cached process-wide, so all sessions and tabs share a single read and derivation.
+    """
+    return with_campaign_rates(load_table("campaigns", CAMPAIGN_COLS))
+
+@st.cache_data
+def roi_by_type(agg="mean"):
+    """ROI per campaign type (`agg` = "mean" or "sum"), in category order, from the shared campaigns view."""
+    return campaign_metrics().groupby("campaign_type", observed=True)["roi"].agg(agg).reset_index()
+
+
+# -------------------------------
+# Plot helpers
+# -------------------------------
+def histogram_figure(edges, counts, colors=None, **layout):
+    """Stacked go.Bar histogram from precomputed (uniform) bin edges and per-group counts."""
+    centers = (edges[:-1] + edges[1:]) / 2
+    colors = colors or [None] * len(counts)
+    fig = go.Figure([
+        go.Bar(x=centers, y=c, width=edges[1] - edges[0], name=str(g), marker_color=color)
+        for (g, c), color in zip(counts.items(), colors)
+    ])
+    fig.update_layout(barmode="stack", bargap=0, yaxis_title="count", **layout)
+    return fig
+
+# Plotly client config for interactive charts: no logo link in the modebar
+CHART_CONFIG = {"displaylogo": False}
+
+# Scatter traces switch to WebGL (scattergl) at this many markers
+WEBGL_MIN_POINTS = 1000
+
+def render_mode(df):
+    """WebGL for per-customer scatters big enough that SVG paint dominates."""
+    return "webgl" if len(df) >= WEBGL_MIN_POINTS else "svg"
+
+# Campaign-level scatters are thinned to this many markers before they reach Plotly
+MAX_SCATTER_POINTS = 5000
+
+def thin_points(df, by=None, max_points=MAX_SCATTER_POINTS):
+    """Deterministic sample of at most ~`max_points` rows, stratified by `by` so every group keeps its share."""
+    if len(df) <= max_points:
+        return df
+    frac = max_points / len(df)
+    if by is None:
+        return df.sample(frac=frac, random_state=0)
+    return df.groupby(by, sort=False, observed=True, group_keys=False).sample(frac=frac, random_state=0)
+
+def bubble_sizes(values, min_px=2.0, max_px=20.0):
+    """float32 marker diameters whose areas scale with `values`, clipped to [min_px, max_px] pixels."""
+    values = np.asarray(values, dtype=np.float32)
+    top = np.nanmax(values) if values.size else np.nan
+    if not top > 0:
+        return np.full(values.shape, min_px, dtype=np.float32)
+    return np.clip(max_px * np.sqrt(values / top), min_px, max_px, dtype=np.float32)
+
+# Past this many points even WebGL saturates; scatters are rasterized server-side instead
+DATASHADER_MIN_POINTS = 50_000
+
+def rasterize_scatter(df, x, y, color, cmap=None, color_key=None, width=800, height=550, **imshow_kwargs):
+    """Shade `df` onto a width x height image with Datashader and wrap it in a Plotly figure.
+
+    Numeric `color` columns are averaged per pixel and mapped through `cmap`, with a matching
+    colorbar on the layout's coloraxis; categorical ones are counted per category and blended
+    with `color_key` (a category -> colour dict), with one legend entry per category.
+    """
+    import datashader as ds  # only needed once a view is large enough to rasterize
+    import datashader.transfer_functions as tf
+    from plotly.colors import unlabel_rgb
+
+    pts = pd.DataFrame({c: df[c].to_numpy("float64", na_value=np.nan) for c in (x, y)})
+    canvas = ds.Canvas(plot_width=width, plot_height=height)
+    if isinstance(df[color].dtype, pd.CategoricalDtype):
+        pts[color] = pd.Categorical(df[color].to_numpy(), categories=list(color_key))
+        agg = canvas.points(pts, x, y, ds.by(color, ds.count()))
+        img = tf.shade(agg, color_key=color_key)
+    else:
+        values = df[color].to_numpy("float64", na_value=np.nan)
+        pts[color] = values
+        # Pin the ramp to the data range so the image and its colorbar share one scale
+        lo, hi = np.nanmin(values), np.nanmax(values)
+        agg = canvas.points(pts, x, y, ds.mean(color))
+        img = tf.shade(agg, cmap=[tuple(int(v) for v in unlabel_rgb(c)) for c in cmap],
+                       how="linear", span=(lo, hi))
+    rgba = img.data.view(np.uint8).reshape(*img.shape, 4)
+    fig = px.imshow(rgba, x=agg.coords[x].values, y=agg.coords[y].values, origin="lower",
+                    binary_string=True, aspect="auto", **imshow_kwargs)
+    # The image carries no colour scale of its own: invisible traces bring back the key
+    if isinstance(df[color].dtype, pd.CategoricalDtype):
+        for cat, c in color_key.items():
+            fig.add_trace(go.Scatter(x=[None], y=[None], mode="markers", name=str(cat),
+                                     marker=dict(color=c), showlegend=True))
+        fig.update_layout(legend_title_text=color)
+    else:
+        fig.add_trace(go.Scatter(x=[None], y=[None], mode="markers", showlegend=False, hoverinfo="skip",
+                                 marker=dict(color=[lo, hi], coloraxis="coloraxis")))
+        fig.update_layout(coloraxis=dict(colorscale=cmap, cmin=lo, cmax=hi))
+    return fig
+
+
+# =====================================================
+# 🏠 OVERVIEW
+# =====================================================
+def render_overview(df_cleaned_f, city, gender):
+    st.header("🏠 Overview: Company KPIs")
+
+    revenue, active, _, satisfaction, churn_rate = kpi_tuple(city, gender)
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Total Revenue", f"${revenue:,.0f}")
+    c2.metric("Active Customers", f"{active:,}")
+    c3.metric("Avg Satisfaction", f"{satisfaction:.2f}")
+    c4.metric("Churn Rate", f"{churn_rate:.1f}%")
+
+    # Normalize recency for consistent color scaling
+    df_cleaned_f["recency_norm"] = minmax_norm(df_cleaned_f["recency_days"].to_numpy(np.float32, na_value=np.nan))
+
+    if len(df_cleaned_f) > DATASHADER_MIN_POINTS:
+        fig_rfm = rasterize_scatter(
+            df_cleaned_f, "frequency", "monetary", "recency_norm",
+            cmap=px.colors.diverging.RdYlGn,
+            title="RFM Distribution: Frequency vs Monetary (colored by Normalized Recency)",
+            labels={"x": "Purchase Frequency", "y": "Monetary Value ($)"},
+            template="plotly_dark",
+            height=550
+        )
+    else:
+        # Raw float32 buffers go over the wire as compact typed arrays
+        trace = go.Scattergl if render_mode(df_cleaned_f) == "webgl" else go.Scatter
+        fig_rfm = go.Figure(trace(
+            x=df_cleaned_f["frequency"].to_numpy(np.float32, na_value=np.nan),
+            y=df_cleaned_f["monetary"].to_numpy(np.float32, na_value=np.nan),
+            mode="markers",
+            # Make points larger and semi-transparent
+            marker=dict(
+                color=df_cleaned_f["recency_norm"].to_numpy(np.float32, na_value=np.nan),
+                coloraxis="coloraxis", size=12, opacity=1, line=dict(width=0)
+            ),
+            hovertemplate=(
+                "Purchase Frequency=%{x}<br>Monetary Value ($)=%{y}<br>"
+                "Normalized Recency (0=Recent, 1=Old)=%{marker.color}<extra></extra>"
+            )
+        ))
+        fig_rfm.update_layout(
+            title="RFM Distribution: Frequency vs Monetary (colored by Normalized Recency)",
+            xaxis_title="Purchase Frequency",
+            yaxis_title="Monetary Value ($)",
+            coloraxis=dict(colorscale="rdylgn"),  # high contrast for dark backgrounds
+            template="plotly_dark",
+            height=550
+        )
+
+    # Adjust colorbar and axes styling
+    fig_rfm.update_layout(
+        coloraxis_colorbar=dict(title="Recency", tickvals=[0, 0.5, 1], ticktext=["Recent", "Medium", "Old"]),
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)",
+        margin=dict(l=40, r=40, t=60, b=40)
+    )
+
+    st.plotly_chart(fig_rfm, use_container_width=True)
+    st.caption("💡 High-frequency, high-monetary customers are your most valuable — typically recent, active buyers.")
+
+# =====================================================
+# 👥 CUSTOMERS
+# =====================================================
+def render_customers(df_predicted_f, city, gender):
+    st.header("👥 Customer Insights")
+
+    fig_city = px.bar(
+        city_spend_top10(city, gender),
+        x="city", y="monetary", title="Top 10 Cities by Total Spend",
+        color="monetary", color_continuous_scale="teal",
+        template="plotly_dark", height=450
+    )
+    st.plotly_chart(fig_city, use_container_width=True)
+    st.caption("💡 San Diego, Los Angeles, and Sacramento are your top revenue contributors — prioritize retention there.")
+
+    fig_gender = px.bar(
+        gender_avg_spend(city, gender),
+        x="gender", y="monetary", color="gender",
+        title="Average Spend by Gender", template="plotly_dark", height=450
+    )
+    st.plotly_chart(fig_gender, use_container_width=True)
+    st.caption("💡 Average spend differs slightly by gender group, with Non-binary and Male showing marginally higher spending.")
+
+    # One fixed colour per segment, so both render paths agree and colours survive filtering
+    segments = df_predicted_f["segment"].cat.categories
+    seg_colors = dict(zip(segments, cycle(px.colors.qualitative.Plotly)))
+    if len(df_predicted_f) > DATASHADER_MIN_POINTS:
+        fig_seg = rasterize_scatter(
+            df_predicted_f, "pca1", "pca2", "segment",
+            color_key=seg_colors, height=500,
+            title="Customer Segments (2D PCA Projection)",
+            labels={"x":"Principal Component 1","y":"Principal Component 2"},
+            template="plotly_dark"
+        )
+    else:
+        fig_seg = px.scatter(
+            df_predicted_f, x="pca1", y="pca2", color="segment", render_mode=render_mode(df_predicted_f),
+            category_orders={"segment": segments.tolist()}, color_discrete_map=seg_colors,
+            title="Customer Segments (2D PCA Projection)",
+            labels={"pca1":"Principal Component 1","pca2":"Principal Component 2"},
+            template="plotly_dark", height=500
+        )
+    st.plotly_chart(fig_seg, use_container_width=True)
+    st.caption("💡 Segments cluster by similar behavioral traits — visually separating high-value vs at-risk customers.")
+
+# =====================================================
+# 💬 SUPPORT
+# =====================================================
+def render_support(df_cleaned_f, city, gender):
+    st.header("💬 Support & Satisfaction")
+
+    fig_support_corr = px.imshow(
+        support_corr(city, gender), x=list(SUPPORT_METRICS), y=list(SUPPORT_METRICS),
+        text_auto=True, color_continuous_scale="balance",
+        title="Support Metrics Correlation Heatmap", template="plotly_dark", height=400
+    )
+    st.plotly_chart(fig_support_corr, use_container_width=True)
+    st.caption("💡 A moderate correlation (0.6–0.7) between tickets, resolution time, and satisfaction suggests service load impacts happiness.")
+
+    fig_spend_satisfaction = px.scatter(
+        df_cleaned_f, x="monetary", y="avg_support_score", render_mode=render_mode(df_cleaned_f),
+        color="avg_support_score", color_continuous_scale="deep",
+        title="Customer Spend vs Support Satisfaction",
+        template="plotly_dark", height=500
+    )
+    st.plotly_chart(fig_spend_satisfaction, use_container_width=True)
+    st.caption("💡 Spend does not always correlate strongly with satisfaction — some high spenders report low satisfaction, signaling service gaps.")
+
+    shap_x = ["avg_resolution_time","total_tickets","monetary","recency_days","avg_rating"]
+    shap_y = [1.3,0.35,0.1,0.09,0.02]
+    fig_shap_satis = go.Figure(go.Bar(
+        x=shap_y, y=shap_x, orientation='h', marker_color="dodgerblue"
+    ))
+    fig_shap_satis.update_layout(template="plotly_dark", title="SHAP Summary: Drivers of Customer Satisfaction", height=400)
+    st.plotly_chart(fig_shap_satis, use_container_width=True)
+    st.caption("💡 Average resolution time has the strongest negative impact on satisfaction — efficiency is key to happier customers.")
+
+# =====================================================
+# 📈 MACHINE LEARNING
+# =====================================================
+def render_ml(city, gender):
+    st.header("📈 Predictive Modeling Insights")
+
+    fig_churn = histogram_figure(
+        *binned_counts("customer_360_predicted", "recency_days", "churn_flag", "auto", city, gender),
+        colors=["tomato", "deepskyblue"], xaxis_title="recency_days", legend_title_text="churn_flag",
+        title="Churn Distribution by Recency (Days)", template="plotly_dark", height=500
+    )
+    st.plotly_chart(fig_churn, use_container_width=True)
+    st.caption("💡 Most churned customers have been inactive for more than 180 days — recency is a strong churn predictor.")
+
+    fig_shap_churn = go.Figure(go.Bar(
+        x=[0.9,0.6,0.4,0.3,0.2],
+        y=["Recency","Monetary","Engagement","Frequency","Satisfaction"],
+        orientation='h', marker_color="gold"
+    ))
+    fig_shap_churn.update_layout(template="plotly_dark", title="Top Drivers of Churn (SHAP Feature Importance)", height=400)
+    st.plotly_chart(fig_shap_churn, use_container_width=True)
+    st.caption("💡 Recency and monetary value dominate churn prediction — indicating loyalty decay after inactivity.")
+
+# =====================================================
+# 💭 SENTIMENT
+# =====================================================
+def render_sentiment(df_enriched_f, city, gender):
+    st.header("💭 Sentiment & Feedback Analysis")
+
+    fig_sentiment = histogram_figure(
+        *binned_counts("customer_360_enriched", "sentiment_score", "sentiment_label", 40, city, gender),
+        xaxis_title="sentiment_score", legend_title_text="sentiment_label",
+        title="Distribution of Customer Sentiment", template="plotly_dark", height=450
+    )
+    st.plotly_chart(fig_sentiment, use_container_width=True)
+    st.caption("💡 Majority of feedback is neutral, but a visible share of negative sentiment indicates improvement opportunities.")
+
+    fig_sent_vs_sat = px.scatter(
+        df_enriched_f, x="sentiment_score", y="avg_support_score", render_mode=render_mode(df_enriched_f),
+        color="avg_support_score", color_continuous_scale="icefire",
+        title="Correlation: Sentiment vs Support Satisfaction", template="plotly_dark", height=450
+    )
+    st.plotly_chart(fig_sent_vs_sat, use_container_width=True)
+    st.caption("💡 Customers expressing positive sentiment also rate support higher, confirming text and survey alignment.")
+
+    topics = pd.DataFrame({"Topic ID":[0,1,2,3,4],"Count":[780,770,950,1100,420]})
+    fig_topics = px.bar(topics, x="Topic ID", y="Count",
+                        color="Count", color_continuous_scale="tealrose",
+                        title="Most Common Customer Feedback Topics",
+                        template="plotly_dark", height=400)
+    st.plotly_chart(fig_topics, use_container_width=True)
+    st.caption("💡 Topics 2 and 3 dominate — representing recurring product or service pain points that require deeper review.")
+
+# =====================================================
+# 📣 CAMPAIGNS
+# =====================================================
+def ctr_scatter(df, **layout):
+    """CTR vs conversion-rate bubbles (area ~ |ROI|) built from float32 buffers, one trace per campaign type."""
+    trace = go.Scattergl if render_mode(df) == "webgl" else go.Scatter
+    # One trace per category, in category order, so colours line up with the ROI bar;
+    # rows without a type (code -1) are left out, as px does
+    codes = df["campaign_type"].cat.codes.to_numpy()
+    types = df["campaign_type"].cat.categories
+    x = df["CTR"].to_numpy(np.float32, na_value=np.nan)
+    y = df["conversion_rate"].to_numpy(np.float32, na_value=np.nan)
+    sizes = bubble_sizes(df["roi_clean"].to_numpy(np.float32, na_value=np.nan))
+    # Numeric hover fields travel as one float32 typed array; names go separately as text
+    hover = np.column_stack([df[c].to_numpy(np.float32, na_value=np.nan) for c in ("roi", "budget")])
+    names = df["campaign_name"].to_numpy(object, na_value=None)
+    fig = go.Figure([
+        trace(
+            x=x[m], y=y[m], mode="markers", name=str(t), legendgroup=str(t),
+            marker=dict(size=sizes[m]), customdata=hover[m], text=names[m],
+            hovertemplate=(
+                f"campaign_type={t}<br>CTR=%{{x}}<br>conversion_rate=%{{y}}<br>"
+                "campaign_name=%{text}<br>roi=%{customdata[0]:.2f}<br>budget=%{customdata[1]:.2f}<extra></extra>"
+            )
+        )
+        for t, m in ((t, codes == i) for i, t in enumerate(types))
+    ])
+    fig.update_layout(xaxis_title="CTR", yaxis_title="conversion_rate",
+                      legend=dict(title_text="campaign_type", itemsizing="constant"), **layout)
+    return fig
+
+@st.cache_resource(show_spinner=False)
+def campaign_figure(height=None):
+    """ROI bar and CTR scatter side by side in one figure, built once per process (and `height`).
+
+    Their inputs never vary with the filters. One figure means one chart element and one
+    Plotly instance in the browser instead of two.
+    """
+    roi = roi_by_type()
+    fig_roi = px.bar(
+        roi, x="campaign_type", y="roi", color="campaign_type",
+        category_orders={"campaign_type": roi["campaign_type"].cat.categories.tolist()}
+    )
+    fig_ctr = ctr_scatter(thin_points(campaign_metrics(), by="campaign_type"))
+
+    fig = make_subplots(rows=1, cols=2, subplot_titles=(
+        "Average ROI by Campaign Type", "CTR vs Conversion Rate by Campaign"
+    ))
+    # A single legend drives both panels: bubbles take their type's bar colour and legend group
+    colors = {t.name: t.marker.color for t in fig_roi.data}
+    for t in fig_roi.data:
+        fig.add_trace(t.update(showlegend=False), row=1, col=1)
+    for t in fig_ctr.data:
+        fig.add_trace(t.update(marker_color=colors.get(t.name)), row=1, col=2)
+    fig.update_xaxes(title_text="campaign_type", row=1, col=1)
+    fig.update_yaxes(title_text="roi", row=1, col=1)
+    fig.update_xaxes(title_text="CTR", row=1, col=2)
+    fig.update_yaxes(title_text="conversion_rate", row=1, col=2)
+    fig.update_layout(legend=fig_ctr.layout.legend, barmode=fig_roi.layout.barmode,
+                      height=height, uirevision="campaigns")
+    return fig
+
+def render_campaigns():
+    st.header("📣 Campaign Effectiveness")
+
+    # Shared cached object: only read here, never mutated
+    st.plotly_chart(campaign_figure(height=450), use_container_width=True, config=CHART_CONFIG)
+    st.caption("💡 Email and search marketing campaigns yield the highest ROI — reallocating budget here could boost returns.")
+    st.caption("💡 Campaigns with high CTR and ROI are well-targeted; low CTR with high spend may indicate creative fatigue or poor targeting.")
+
+# =====================================================
+# 🧾 EXECUTIVE SUMMARY
+# =====================================================
+EXEC_SUMMARY_MD = """
+    ### 📊 Key Insights
+    - San Diego, Los Angeles, and Sacramento are top-spending cities.  
+    - Customers with higher frequency and recency show the highest CLV.  
+    - Long support resolution times are the main driver of low satisfaction.  
+    - Sentiment analysis confirms that tone of feedback aligns with survey scores.  
+    - Email and Search Engine Marketing provide the highest ROI.  
+    - Clustering identified distinct behavioral segments; 2 are high-value, 1 is at-risk.
+
+    ### 💡 Recommendations
+    1. Re-engage churn-risk customers via personalized email/SMS campaigns.
+    2. Reduce average resolution time below 5 hours to enhance satisfaction.
+    3. Track sentiment monthly to detect emerging product/service issues.
+    4. Reallocate marketing spend toward top-performing digital channels.
+    5. Use cluster-based personalization for loyalty programs.
+
+    ---
+    **This dashboard unifies customer, support, sentiment, and marketing insights into a single 360° executive view.**
+    """
+
+@st.fragment
+def render_summary():
+    st.header("🧾 Executive Summary & Recommendations")
+
+    st.markdown(EXEC_SUMMARY_MD)
+    st.success("Executive summary ready for leadership presentation.")
@@ -0,0 +1,102 @@
+# _kernels.py
+# Numba-compiled single-pass reductions shared by the dashboards.
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def overview_kpis(monetary, has_txn, support, churn):
+    """Return (revenue, active customers, avg support score, churn share) in one pass.
+
+    NaNs are skipped like pandas' sum/mean; `churn` may come from another table
+    and so can differ in length from the other three arrays.
+    """
+    revenue = 0.0
+    active = 0
+    support_sum = 0.0
+    support_n = 0
+    for i in range(monetary.size):
+        if not np.isnan(monetary[i]):
+            revenue += monetary[i]
+        if has_txn[i] == 1:
+            active += 1
+        if not np.isnan(support[i]):
+            support_sum += support[i]
+            support_n += 1
+    churned = 0
+    for i in range(churn.size):
+        if churn[i] == 1:
+            churned += 1
+    avg_support = support_sum / support_n if support_n else np.nan
+    churn_share = churned / churn.size if churn.size else np.nan
+    return revenue, active, avg_support, churn_share
+
+
+@njit(cache=True)
+def minmax_norm(x):
+    """Scale `x` to [0, 1]: one pass for min/max, one multiply-by-reciprocal pass.
+
+    NaNs are ignored for the range and stay NaN; a constant input maps to NaN,
+    matching the pandas (x - min) / (max - min) expression it replaces.
+    """
+    lo = np.inf
+    hi = -np.inf
+    for v in x:
+        if v < lo:
+            lo = v
+        if v > hi:
+            hi = v
+    out = np.empty_like(x)
+    if not hi > lo:
+        out[:] = np.nan
+        return out
+    inv = 1.0 / (hi - lo)
+    for i in range(x.size):
+        out[i] = (x[i] - lo) * inv
+    return out
+
+
+@njit(cache=True)
+def grouped_hist(values, codes, ngroups, edges):
+    """Count `values` per group code over uniform bin `edges` in a single pass.
+
+    Binning matches np.histogram (last bin closed, out-of-range and NaN values
+    dropped); rows with a negative code are skipped.
+    """
+    nbins = edges.size - 1
+    out = np.zeros((ngroups, nbins), np.int64)
+    lo = edges[0]
+    hi = edges[-1]
+    inv = nbins / (hi - lo)
+    for i in range(values.size):
+        v = values[i]
+        g = codes[i]
+        if g < 0 or not (lo <= v <= hi):
+            continue
+        b = min(int((v - lo) * inv), nbins - 1)
+        # Correct for rounding so a value on an edge lands where np.histogram puts it
+        if v < edges[b]:
+            b -= 1
+        elif b + 1 < nbins and v >= edges[b + 1]:
+            b += 1
+        out[g, b] += 1
+    return out
+
+
+@njit(cache=True)
+def campaign_rates(clicks, impressions, budget, roi):
+    """Return (CTR, CPC, roi_clean) from one pass over the four campaign columns.
+
+    A zero denominator gives 0 while a missing one propagates NaN; roi_clean is
+    |roi| with NaN replaced by 0.01.
+    """
+    n = clicks.size
+    ctr = np.empty(n, clicks.dtype)
+    cpc = np.empty(n, clicks.dtype)
+    roi_clean = np.empty(n, clicks.dtype)
+    for i in range(n):
+        ctr[i] = clicks[i] / impressions[i] if impressions[i] != 0 else 0.0
+        cpc[i] = budget[i] / clicks[i] if clicks[i] != 0 else 0.0
+        r = roi[i]
+        roi_clean[i] = 0.01 if np.isnan(r) else abs(r)
+    return ctr, cpc, roi_clean
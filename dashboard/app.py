@@ -1,60 +1,62 @@
 # app.py
 import streamlit as st
-import pandas as pd
-import sqlite3
+import numpy as np
 import plotly.express as px
 
+from _core import (
+    binned_counts, city_spend_top10, filter_options, gender_avg_spend, histogram_figure,
+    kpi_tuple, load_table, render_mode, roi_by_type,
+)
+
 st.set_page_config(page_title="Customer Experience Dashboard", layout="wide")
 
 # --- Load data ---
-@st.cache_data
-def load_data():
-    conn = sqlite3.connect("./../sql/retail_customer_experience.db")
-    df = pd.read_sql_query("SELECT * FROM customer_360_cleaned;", conn)
-    return df
+# Only the columns the per-customer charts read; KPIs and aggregates load their own,
+# and city/gender are added by the loader when a filter is set.
+CUSTOMER_COLS = ("customer_id", "total_tickets", "avg_resolution_time", "avg_support_score")
 
-customer_df = load_data()
+cities, genders = filter_options()
 st.sidebar.title("Filters")
 
 # Sidebar filters
-# Clean up city and gender values before sorting
-city_options = ["All"] + sorted([str(x) for x in customer_df["city"].dropna().unique()])
-gender_options = ["All"] + sorted([str(x) for x in customer_df["gender"].dropna().unique()])
+city_options = ["All"] + cities
+gender_options = ["All"] + genders
 
 city = st.sidebar.selectbox("Select City", city_options)
 gender = st.sidebar.selectbox("Select Gender", gender_options)
 
 
-# Filter logic
-filtered_df = customer_df.copy()
-if city != "All":
-    filtered_df = filtered_df[filtered_df["city"] == city]
-if gender != "All":
-    filtered_df = filtered_df[filtered_df["gender"] == gender]
+# Filter logic (applied inside the cached loader)
+city_f = None if city == "All" else city
+gender_f = None if gender == "All" else gender
+filtered_df = load_table("customer_360_cleaned", CUSTOMER_COLS, city_f, gender_f)
 
 # --- Tabs ---
 tab1, tab2, tab3, tab4 = st.tabs(["🏠 Overview", "🧍 Customers", "💬 Support", "📈 Campaigns"])
 
 with tab1:
     st.header("Company Overview")
+    revenue, active, customers, satisfaction, _ = kpi_tuple(city_f, gender_f)
+    # "Churn" here is the inactive share: customers without a transaction
+    churn_rate = (1 - active / customers) * 100 if customers else np.nan
     col1, col2, col3 = st.columns(3)
-    col1.metric("Total Revenue", f"${filtered_df['monetary'].sum():,.0f}")
-    col2.metric("Avg Satisfaction", f"{filtered_df['avg_support_score'].mean():.2f}")
-    churn_rate = (filtered_df['has_transaction']==0).mean()*100
+    col1.metric("Total Revenue", f"${revenue:,.0f}")
+    col2.metric("Avg Satisfaction", f"{satisfaction:.2f}")
     col3.metric("Churn Rate (Inactive)", f"{churn_rate:.1f}%")
 
-    fig_rev = px.histogram(filtered_df, x='monetary', nbins=30, title='Distribution of Customer Spend')
+    fig_rev = histogram_figure(*binned_counts("customer_360_cleaned", "monetary", bins=30, city=city_f, gender=gender_f),
+                               xaxis_title='monetary', showlegend=False, title='Distribution of Customer Spend')
     st.plotly_chart(fig_rev, use_container_width=True)
 
 
 with tab2:
     st.header("Customer Insights")
 
-    fig_city = px.bar(filtered_df.groupby('city')['monetary'].sum().reset_index().sort_values('monetary', ascending=False),
-                      x='city', y='monetary', title='Total Spend by City')
+    fig_city = px.bar(city_spend_top10(city_f, gender_f),
+                      x='city', y='monetary', title='Top 10 Cities by Total Spend')
     st.plotly_chart(fig_city, use_container_width=True)
 
-    fig_gender = px.bar(filtered_df.groupby('gender')['monetary'].mean().reset_index(),
+    fig_gender = px.bar(gender_avg_spend(city_f, gender_f),
                         x='gender', y='monetary', title='Average Spend by Gender')
     st.plotly_chart(fig_gender, use_container_width=True)
 
@@ -63,16 +65,16 @@ with tab3:
     st.header("Support & Satisfaction")
 
     fig_support = px.scatter(filtered_df, x='avg_resolution_time', y='avg_support_score',
-                             color='total_tickets', title='Resolution Time vs Satisfaction')
+                             color='total_tickets', title='Resolution Time vs Satisfaction',
+                             render_mode=render_mode(filtered_df))
     st.plotly_chart(fig_support, use_container_width=True)
 
     st.subheader("Support Summary")
-    st.dataframe(filtered_df[['customer_id', 'total_tickets', 'avg_support_score']].sort_values('avg_support_score', ascending=False).head(10))
+    st.dataframe(filtered_df.nlargest(10, 'avg_support_score')[['customer_id', 'total_tickets', 'avg_support_score']])
 
 
 with tab4:
     st.header("Marketing Campaigns")
-    conn = sqlite3.connect("./../sql/retail_customer_experience.db")
-    campaigns = pd.read_sql_query("SELECT * FROM campaigns;", conn)
-    fig_roi = px.bar(campaigns, x='campaign_type', y='roi', title='Campaign ROI by Type')
+    # Per-type totals from a cached lookup table: same bar heights as stacking every campaign row
+    fig_roi = px.bar(roi_by_type("sum"), x='campaign_type', y='roi', title='Campaign ROI by Type')
     st.plotly_chart(fig_roi, use_container_width=True)
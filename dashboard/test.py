@@ -1,46 +1,69 @@
 import streamlit as st
 import pandas as pd
-import sqlite3
 import plotly.express as px
 import plotly.graph_objects as go
 
+from _core import (
+    CHART_CONFIG, CLEANED_COLS, ENRICHED_COLS, SUPPORT_METRICS,
+    binned_counts, campaign_figure, city_spend_top10, filter_options, gender_avg_spend,
+    histogram_figure, kpi_tuple, load_table, render_mode, support_corr,
+)
+
 st.set_page_config(page_title="Customer Experience Executive Dashboard", layout="wide")
 
 # -------------------------------
 # Load data
 # -------------------------------
-@st.cache_data
-def load_table(table):
-    conn = sqlite3.connect("./../sql/retail_customer_experience.db")
-    df = pd.read_sql_query(f"SELECT * FROM {table};", conn)
-    conn.close()
-    return df
-
-df_cleaned = load_table("customer_360_cleaned")
-df_enriched = load_table("customer_360_enriched")
-df_predicted = load_table("customer_360_predicted")
-df_campaigns = load_table("campaigns")
+# The cluster heatmap also averages RFM features per segment, so this set is wider than _core's;
+# aggregates load their own columns.
+PREDICTED_COLS = ("recency_days", "frequency", "monetary", "satisfaction_index", "engagement_score",
+                  "segment", "pca1", "pca2")
+
+df_cleaned = load_table("customer_360_cleaned", CLEANED_COLS)
+df_enriched = load_table("customer_360_enriched", ENRICHED_COLS)
+df_predicted = load_table("customer_360_predicted", PREDICTED_COLS)
 
 # -------------------------------
 # Sidebar Filters
 # -------------------------------
+cities, genders = filter_options()
 st.sidebar.header("🔎 Filters")
-city = st.sidebar.selectbox("City", ["All"] + sorted(df_cleaned["city"].dropna().unique().tolist()))
-gender = st.sidebar.selectbox("Gender", ["All"] + sorted(df_cleaned["gender"].dropna().unique().tolist()))
+city = st.sidebar.selectbox("City", ["All"] + cities)
+gender = st.sidebar.selectbox("Gender", ["All"] + genders)
+
+# Only the overview KPIs honour the filters (applied inside the cached loader).
+city_f = None if city == "All" else city
+gender_f = None if gender == "All" else gender
+
+# Static executive summary, built once at import rather than per rerun
+EXEC_SUMMARY_MD = """
+    ### 📊 Key Insights
+    - San Diego, Los Angeles, and Sacramento are top-spending cities.  
+    - Customers with higher frequency and recency show the highest CLV.  
+    - Long support resolution times are the main driver of low satisfaction.  
+    - Sentiment analysis confirms that tone of feedback aligns with survey scores.  
+    - Email and Search Engine Marketing provide the highest ROI.  
+    - Clustering identified 5–6 behavioral segments; 2 are high-value, 1 is high-risk.
 
-filtered = df_enriched.copy()
-if city != "All":
-    filtered = filtered[filtered["city"] == city]
-if gender != "All":
-    filtered = filtered[filtered["gender"] == gender]
+    ### 💡 Recommendations
+    1. Re-engage churn-risk customers using email and SMS campaigns.
+    2. Reduce average resolution time to below 5 hours for higher satisfaction.
+    3. Track sentiment monthly to preempt negative experiences.
+    4. Allocate marketing budget toward high-performing digital channels.
+    5. Use customer segments for personalized offers and retention.
+
+    ---
+    **This dashboard unifies customer, support, sentiment, and marketing insights into a single 360° view.**
+    """
 
 # -------------------------------
 # Tabs
 # -------------------------------
+# Tab switches rerun the script so `.open` is known; tab6 only renders while selected
 tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
     "🏠 Overview", "👥 Customers", "💬 Support",
     "📈 ML Insights", "💭 Sentiment", "📣 Campaigns", "🧾 Executive Summary"
-])
+], key="active_tab", on_change="rerun")
 
 # =====================================================
 # 🏠 OVERVIEW
@@ -49,14 +72,15 @@ with tab1:
     st.header("🏠 Overview: Company KPIs")
 
     c1, c2, c3, c4 = st.columns(4)
-    c1.metric("Total Revenue", f"${filtered['monetary'].sum():,.0f}")
-    c2.metric("Active Customers", f"{(filtered['has_transaction']==1).sum():,}")
-    c3.metric("Avg Satisfaction", f"{filtered['avg_support_score'].mean():.2f}")
-    churn_rate = (df_predicted["churn_flag"]==1).mean()*100
+    revenue, active, _, satisfaction, _ = kpi_tuple(city_f, gender_f)
+    churn_rate = kpi_tuple(None, None)[4]  # churn is shown for the whole base
+    c1.metric("Total Revenue", f"${revenue:,.0f}")
+    c2.metric("Active Customers", f"{active:,}")
+    c3.metric("Avg Satisfaction", f"{satisfaction:.2f}")
     c4.metric("Churn Rate", f"{churn_rate:.1f}%")
 
     fig_rfm = px.scatter(
-        df_cleaned, x="frequency", y="monetary",
+        df_cleaned, x="frequency", y="monetary", render_mode=render_mode(df_cleaned),
         color="recency_days", color_continuous_scale="RdBu_r",
         title="RFM Distribution: Frequency vs Monetary (colored by Recency)",
         labels={"frequency":"Frequency", "monetary":"Monetary Value"}
@@ -71,28 +95,28 @@ with tab2:
 
     # Top 10 Cities by Spend
     fig_city = px.bar(
-        df_cleaned.groupby("city")["monetary"].sum().nlargest(10).reset_index(),
+        city_spend_top10(None, None),
         x="city", y="monetary", title="Top 10 Cities by Total Spend"
     )
     st.plotly_chart(fig_city, use_container_width=True)
 
     # Average Spend by Gender
     fig_gender = px.bar(
-        df_cleaned.groupby("gender")["monetary"].mean().reset_index(),
+        gender_avg_spend(None, None),
         x="gender", y="monetary", color="gender", title="Average Spend by Gender"
     )
     st.plotly_chart(fig_gender, use_container_width=True)
 
     # PCA Segments
     fig_seg = px.scatter(
-        df_predicted, x="pca1", y="pca2", color="segment",
+        df_predicted, x="pca1", y="pca2", color="segment", render_mode=render_mode(df_predicted),
         title="Customer Segments (2D PCA Projection)",
         labels={"pca1":"Principal Component 1","pca2":"Principal Component 2"}
     )
     st.plotly_chart(fig_seg, use_container_width=True)
 
     # Cluster averages
-    cluster_summary = df_predicted.groupby("segment")[["recency_days","frequency","monetary","satisfaction_index","engagement_score"]].mean().reset_index()
+    cluster_summary = df_predicted.groupby("segment", observed=True)[["recency_days","frequency","monetary","satisfaction_index","engagement_score"]].mean().reset_index()
     fig_cluster = px.imshow(
         cluster_summary.set_index("segment"),
         text_auto=True, color_continuous_scale="Blues", title="Average Feature Values by Cluster"
@@ -106,13 +130,13 @@ with tab3:
     st.header("💬 Support & Satisfaction")
 
     fig_support_corr = px.imshow(
-        df_cleaned[['total_tickets','avg_resolution_time','avg_support_score']].corr(),
+        support_corr(None, None), x=list(SUPPORT_METRICS), y=list(SUPPORT_METRICS),
         text_auto=True, color_continuous_scale="RdBu_r", title="Support Metrics Correlation Heatmap"
     )
     st.plotly_chart(fig_support_corr, use_container_width=True)
 
     fig_spend_satisfaction = px.scatter(
-        df_cleaned, x="monetary", y="avg_support_score",
+        df_cleaned, x="monetary", y="avg_support_score", render_mode=render_mode(df_cleaned),
         title="Customer Spend vs Support Satisfaction"
     )
     st.plotly_chart(fig_spend_satisfaction, use_container_width=True)
@@ -133,8 +157,9 @@ with tab4:
     st.header("📈 Predictive Modeling Insights")
 
     # Churn Distribution
-    fig_churn = px.histogram(
-        df_predicted, x="recency_days", color="churn_flag",
+    fig_churn = histogram_figure(
+        *binned_counts("customer_360_predicted", "recency_days", "churn_flag", "auto"),
+        xaxis_title="recency_days", legend_title_text="churn_flag",
         title="Churn Distribution by Recency (Days)"
     )
     st.plotly_chart(fig_churn, use_container_width=True)
@@ -155,15 +180,16 @@ with tab5:
     st.header("💭 Sentiment & Feedback Analysis")
 
     # Sentiment Distribution
-    fig_sentiment = px.histogram(
-        df_enriched, x="sentiment_score", nbins=40, color="sentiment_label",
+    fig_sentiment = histogram_figure(
+        *binned_counts("customer_360_enriched", "sentiment_score", "sentiment_label", 40),
+        xaxis_title="sentiment_score", legend_title_text="sentiment_label",
         title="Distribution of Customer Sentiment"
     )
     st.plotly_chart(fig_sentiment, use_container_width=True)
 
     # Sentiment vs Satisfaction
     fig_sent_vs_sat = px.scatter(
-        df_enriched, x="sentiment_score", y="avg_support_score",
+        df_enriched, x="sentiment_score", y="avg_support_score", render_mode=render_mode(df_enriched),
         title="Correlation: Sentiment vs Support Satisfaction"
     )
     st.plotly_chart(fig_sent_vs_sat, use_container_width=True)
@@ -177,59 +203,22 @@ with tab5:
 # 📣 CAMPAIGNS TAB
 # =====================================================
 with tab6:
-    st.header("📣 Campaign Effectiveness")
-
-    # Clean and prepare campaign data
-    df_campaigns["CTR"] = df_campaigns["clicks"] / df_campaigns["impressions"]
-    df_campaigns["CPC"] = df_campaigns["budget"] / df_campaigns["clicks"]
-    df_campaigns["roi_clean"] = df_campaigns["roi"].abs().fillna(0.01)   # ✅ define here
-
-    # --- ROI Bar Chart ---
-    fig_roi = px.bar(
-        df_campaigns,
-        x="campaign_type",
-        y="roi",
-        color="campaign_type",
-        title="Average ROI by Campaign Type"
-    )
-    st.plotly_chart(fig_roi, use_container_width=True)
-
-    # --- CTR vs Conversion Rate ---
-    fig_ctr = px.scatter(
-        df_campaigns,
-        x="CTR",
-        y="conversion_rate",
-        size="roi_clean",  # ✅ now column exists
-        color="campaign_type",
-        title="CTR vs Conversion Rate by Campaign",
-        hover_data=["campaign_name", "roi", "budget"]
-    )
-    st.plotly_chart(fig_ctr, use_container_width=True)
+    if tab6.open:
+        st.header("📣 Campaign Effectiveness")
+
+        # ROI bar and CTR scatter share one cached figure; it is only read here
+        st.plotly_chart(campaign_figure(), use_container_width=True, config=CHART_CONFIG)
 
 
 # =====================================================
 # 🧾 EXECUTIVE SUMMARY
 # =====================================================
-with tab7:
+@st.fragment
+def render_summary():
     st.header("🧾 Executive Summary & Recommendations")
 
-    st.markdown("""
-    ### 📊 Key Insights
-    - San Diego, Los Angeles, and Sacramento are top-spending cities.  
-    - Customers with higher frequency and recency show the highest CLV.  
-    - Long support resolution times are the main driver of low satisfaction.  
-    - Sentiment analysis confirms that tone of feedback aligns with survey scores.  
-    - Email and Search Engine Marketing provide the highest ROI.  
-    - Clustering identified 5–6 behavioral segments; 2 are high-value, 1 is high-risk.
-
-    ### 💡 Recommendations
-    1. Re-engage churn-risk customers using email and SMS campaigns.
-    2. Reduce average resolution time to below 5 hours for higher satisfaction.
-    3. Track sentiment monthly to preempt negative experiences.
-    4. Allocate marketing budget toward high-performing digital channels.
-    5. Use customer segments for personalized offers and retention.
-
-    ---
-    **This dashboard unifies customer, support, sentiment, and marketing insights into a single 360° view.**
-    """)
+    st.markdown(EXEC_SUMMARY_MD)
     st.success("Executive summary ready for leadership presentation.")
+
+with tab7:
+    render_summary()
@@ -0,0 +1,75 @@
+# test_kernels.py
+# Regression checks for the Numba kernels against the numpy/pandas logic they replace.
+import numpy as np
+import pandas as pd
+import pytest
+
+from _kernels import campaign_rates, grouped_hist, minmax_norm, overview_kpis
+
+
+def _reference_hist(values, codes, ngroups, edges):
+    return np.stack([np.histogram(values[codes == g], bins=edges)[0] for g in range(ngroups)])
+
+
+@pytest.mark.parametrize("bins", [1, 7, 30, "auto"])
+def test_grouped_hist_matches_np_histogram(bins):
+    rng = np.random.default_rng(0)
+    values = rng.normal(50, 20, 5000)
+    codes = rng.integers(0, 3, values.size)
+    edges = np.histogram_bin_edges(values, bins=bins)
+    got = grouped_hist(values, codes, 3, edges)
+    np.testing.assert_array_equal(got, _reference_hist(values, codes, 3, edges))
+
+
+def test_grouped_hist_values_on_bin_edges():
+    # Non-representable edges (0.1 steps) are where the rounding correction matters
+    edges = np.histogram_bin_edges(np.array([0.0, 3.0]), bins=30)
+    values = np.concatenate([edges, edges, np.nextafter(edges, -np.inf), np.nextafter(edges, np.inf)])
+    codes = np.repeat(np.arange(2), values.size // 2)
+    got = grouped_hist(values, codes, 2, edges)
+    np.testing.assert_array_equal(got, _reference_hist(values, codes, 2, edges))
+
+
+def test_grouped_hist_skips_nan_out_of_range_and_negative_codes():
+    edges = np.linspace(0.0, 1.0, 5)
+    values = np.array([0.1, np.nan, -0.5, 1.5, 0.9, 0.6])
+    codes = np.array([0, 0, 0, 0, -1, 1])
+    got = grouped_hist(values, codes, 2, edges)
+    np.testing.assert_array_equal(got, [[1, 0, 0, 0], [0, 0, 1, 0]])
+
+
+def test_minmax_norm_matches_pandas_and_keeps_nan():
+    x = np.array([3.0, np.nan, 1.0, 5.0, 2.0], dtype=np.float32)
+    s = pd.Series(x)
+    expected = ((s - s.min()) / (s.max() - s.min())).to_numpy()
+    got = minmax_norm(x)
+    assert got.dtype == np.float32
+    np.testing.assert_allclose(got, expected, rtol=1e-6)
+    assert np.isnan(got[1])
+
+
+@pytest.mark.parametrize("x", [np.full(4, 2.5), np.array([np.nan, 2.5, np.nan]), np.full(3, np.nan)])
+def test_minmax_norm_constant_or_empty_range_is_nan(x):
+    assert np.isnan(minmax_norm(x)).all()
+
+
+def test_campaign_rates_zero_and_missing_denominators():
+    clicks = np.array([10, 0, 5, np.nan, 4], dtype=np.float32)
+    impressions = np.array([100, 50, 0, 20, np.nan], dtype=np.float32)
+    budget = np.array([20, 30, np.nan, 10, 8], dtype=np.float32)
+    roi = np.array([1.5, -2.0, np.nan, 0.0, 3.0], dtype=np.float32)
+    ctr, cpc, roi_clean = campaign_rates(clicks, impressions, budget, roi)
+
+    assert ctr.dtype == cpc.dtype == roi_clean.dtype == np.float32
+    np.testing.assert_allclose(ctr, [0.1, 0.0, 0.0, np.nan, np.nan])
+    np.testing.assert_allclose(cpc, [2.0, 0.0, np.nan, np.nan, 2.0])
+    np.testing.assert_allclose(roi_clean, [1.5, 2.0, 0.01, 0.0, 3.0], rtol=1e-6)
+
+
+def test_overview_kpis_skips_nan_and_counts_churn_separately():
+    monetary = np.array([10.0, np.nan, 5.0])
+    has_txn = np.array([1, 0, 1], dtype=np.int8)
+    support = np.array([4.0, 2.0, np.nan])
+    churn = np.array([1, 0, 0, 1], dtype=np.int8)
+    revenue, active, avg_support, churn_share = overview_kpis(monetary, has_txn, support, churn)
+    assert (revenue, active, avg_support, churn_share) == (15.0, 2, 3.0, 0.5)